@@ -1,11 +1,25 @@
 """dcv.cli"""
 import asyncio
+import logging
+import os
 import platform
-from typing import Optional
+from typing import Any, Coroutine, Optional
 
 import typer
 
 import dcv.utils as dcv
+from dcv.errors import DCVAPIError
+
+# aiodns and friends need the selector loop, set it once for every command
+if platform.system() == "Windows":
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+else:
+    try:  # Faster event loop, optional
+        import uvloop
+    except ImportError:
+        pass
+    else:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 app = typer.Typer(
     name="dcv",
@@ -14,6 +28,26 @@ app = typer.Typer(
 )
 
 
+def run(coroutine: Coroutine[Any, Any, None]) -> None:
+    """
+    Run a dcv coroutine, exit non-zero if an API call failed along the way
+
+    Args:
+        coroutine: dcv.utils coroutine to run
+
+    Returns:
+        None
+
+    Raises:
+        typer.Exit: on DCVAPIError
+    """
+    try:
+        asyncio.run(coroutine)
+    except DCVAPIError as e:
+        print(f"\nAPI Error: {e}\n")
+        raise typer.Exit(code=1) from e
+
+
 @app.command("check", help="Check domains for expiring 'soon' validations.")
 def check(
     key: Optional[str] = typer.Option(
@@ -49,14 +83,10 @@ def check(
 
     if domain_name:
         print(f"Checking status and expiration of {domain_name}..\n\n")
-        if platform.system() == "Windows":
-            asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-        asyncio.run(dcv.check_single(key=key, domain_name=domain_name))
+        run(dcv.check_single(key=key, domain_name=domain_name))
     else:
         print(f"Checking for expiring domains within {num_days} from now..\n")
-        if platform.system() == "Windows":
-            asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-        asyncio.run(dcv.check(key=key, num_days=num_days))
+        run(dcv.check(key=key, num_days=num_days))
 
     print("\nThank you for using DCV.\n")
 
@@ -90,6 +120,12 @@ def validate(
     timeout: Optional[int] = typer.Option(
         180, help="Timeout length (in seconds) waiting for validation"
     ),
+    assume_yes: bool = typer.Option(
+        False,
+        "--yes",
+        "-y",
+        help="Don't ask for confirmation before validating.",
+    ),
 ) -> None:
     """
     Validate a SINGLE domain via commandline
@@ -100,6 +136,7 @@ def validate(
         password: Neustar/UltraDNS Password
         domain_name: Domain Name (FQDN) to validate
         timeout: Optional int, length of timeout in seconds on validation check
+        assume_yes: Don't ask for confirmation before validating
 
     Returns:
         None
@@ -109,15 +146,14 @@ def validate(
     """
 
     print(f"Validating expiring domain {domain_name} manually..\n\n")
-    if platform.system() == "Windows":
-        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-    asyncio.run(
+    run(
         dcv.validate_single(
             key=key,
             username=username,
             password=password,
             domain_name=domain_name,
             timeout=timeout,
+            assume_yes=assume_yes,
         )
     )
     print("\nThank you for using DCV.\n")
@@ -153,6 +189,17 @@ def run_all(
     timeout: Optional[int] = typer.Option(
         180, help="Timeout length (in seconds) to wait for validation."
     ),
+    concurrency: int = typer.Option(
+        dcv.DEFAULT_CONCURRENCY,
+        min=1,
+        help="Max number of domains validated at the same time (DigiCert rate-limits).",
+    ),
+    assume_yes: bool = typer.Option(
+        False,
+        "--yes",
+        "-y",
+        help="Don't ask for confirmation before validating.",
+    ),
 ) -> None:
     """
     Run all the things
@@ -168,6 +215,8 @@ def run_all(
         num_days: Number of days till considered 'expiring soon'
         file: Filename/path to filename containing list of domains, one domain per line
         timeout: Optional int, length of timeout in seconds to wait for validaton
+        concurrency: max number of domains validated at the same time
+        assume_yes: Don't ask for confirmation before validating
 
     Returns:
         None
@@ -180,9 +229,7 @@ def run_all(
         f"Checking for and Validating expiring domains within {num_days} from now..\n\n"
     )
     # Async validate dem mains!
-    if platform.system() == "Windows":
-        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-    asyncio.run(
+    run(
         dcv.runall(
             key=key,
             username=username,
@@ -190,6 +237,8 @@ def run_all(
             timeout=timeout,
             file=file,
             num_days=num_days,
+            concurrency=concurrency,
+            assume_yes=assume_yes,
         )
     )
     print("\nThank you for using DCV.)\n")
@@ -198,7 +247,7 @@ def run_all(
 @app.callback()
 def begin() -> None:
     """
-    Print the opening banner
+    Print the opening banner, set the dcv.log level from DCV_LOG (default INFO)
 
     Args:
     Returns:
@@ -208,6 +257,13 @@ def begin() -> None:
         N/A
     """
 
+    # DEBUG adds the (redacted) request details of failed API calls to dcv.log
+    level = os.environ.get("DCV_LOG", "INFO").upper()
+    if not isinstance(logging.getLevelName(level), int):  # Not a known level name
+        print(f"Warning: unknown DCV_LOG level {level}, using INFO")
+        level = "INFO"
+    logging.getLogger("dcv").setLevel(level)
+
     print("")
     print("DCV - Domain Control Validation using Digicert and Nuestar/UltraDNS API's")
     print("")
@@ -1,12 +1,20 @@
 """dcv.dns_updater"""
-import json
 import logging
-import sys
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
+import orjson
 
-logger = logging.getLogger("utils")
+from dcv.errors import DCVAPIError
+from dcv.transport import client_kwargs
+
+logger = logging.getLogger("dcv")
+
+_ZONE_CACHE_TTL = 300  # seconds, zones change on human timescales
+_BASE_URL = "https://api.ultradns.com/"
+_CNAME_URL = "zones/{domain_name}./rrsets/cname/{cname}".format  # relative to _BASE_URL
+_JSON_HEADERS = {"Content-Type": "application/json"}
 
 
 class DNSUpdater:
@@ -29,12 +37,33 @@ class DNSUpdater:
 
         self.username = username
         self.password = password
-        self.session: Dict[str, Any] = {}
         self.key = ""
+        self.zones_cache: Dict[Optional[str], Tuple[float, Any]] = {}
+        self._client = httpx.AsyncClient(
+            **client_kwargs(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=200,
+                    max_keepalive_connections=100,
+                    keepalive_expiry=60.0,
+                ),
+            ),
+            base_url=_BASE_URL,
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
 
-    async def login(self) -> None:
+    async def __aenter__(self) -> "DNSUpdater":
+        """Async context manager entry, returns this instance"""
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Async context manager exit, closes the http client"""
+        await self.aclose()
+
+    async def aclose(self) -> None:
         """
-        Login to API & get token
+        Close the underlying http client and release its pooled connections
 
         Args:
             N/A
@@ -45,39 +74,71 @@ class DNSUpdater:
         Raises:
             N/A
         """
-        sess = httpx.AsyncClient()
+        await self._client.aclose()
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send a request to the Neustar/UltraDNS API
+
+        Args:
+            method: HTTP method
+            url: URL, relative to the Neustar/UltraDNS API base
+            kwargs: passed through to httpx.AsyncClient.request
+
+        Returns:
+            httpx.Response, successful (2xx)
 
-        url = "https://api.ultradns.com/authorization/token"
+        Raises:
+            DCVAPIError: API request failed
+        """
+        try:
+            response = await self._client.request(method, url, **kwargs)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            # Never log data=, it's the login form with the password in it
+            logger.debug(
+                "Request failed: method=%s url=%s content=%s",
+                method,
+                url,
+                kwargs.get("content"),
+            )
+            logger.error("%s %s failed: %s", method, e.request.url, e)
+            raise DCVAPIError(f"{e.request.url}: {e}") from e
+
+        return response
+
+    async def login(self) -> None:
+        """
+        Login to API & get token
+
+        Args:
+            N/A
+
+        Returns:
+            None
+
+        Raises:
+            DCVAPIError: API request failed
+        """
+        url = "authorization/token"
         payload = {
             "grant_type": "password",
             "username": self.username,
             "password": self.password,
         }
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        try:
-            response = await sess.post(url=url, headers=headers, data=payload)
-            response.raise_for_status()
-        except httpx.RequestError as e:
-            print(f"{url=}, {headers=}, {payload=}")
-            print("Request error: ", e)
-            sys.exit()
-        except httpx.HTTPStatusError as e:
-            print(f"{url=}, {headers=}, {payload=}")
-            print("HTTP Status error: ", e)
-            sys.exit()
-
-        self.key = response.json().get("access_token")
+        response = await self._request("POST", url, data=payload)
+
+        self.key = orjson.loads(response.content).get("access_token")
         if not self.key:
-            print(
+            raise DCVAPIError(
                 "Unknown Error logging into Neustar/UltraDNS, could not get access_token."
             )
-            sys.exit(1)
 
-        self.session[self.key] = sess
+        self._client.headers["Authorization"] = f"Bearer {self.key}"
 
     async def get_zones(self, zone_name: Optional[str]) -> List[Dict[str, Any]]:
         """
-        Get zone or zones
+        Get zone or zones, cached for a few minutes
 
         Args:
             zone_name: fqdn of domain
@@ -86,35 +147,22 @@ class DNSUpdater:
             List of all (or single) zone
 
         Raises:
-            N/A
+            DCVAPIError: API request failed
         """
 
-        url = (
-            "https://api.ultradns.com/zones"
-            if not zone_name
-            else f"https://api.ultradns.com/zones/{zone_name}"
-        )
+        cached = self.zones_cache.get(zone_name)
+        if cached and time.monotonic() - cached[0] < _ZONE_CACHE_TTL:
+            return cached[1]
 
-        headers = {
-            "Content-Type": "application/x-www-form-urlencoded",
-            "Authorization": f"Bearer {self.key}",
-        }
-        try:
-            response = await self.session[self.key].get(url=url, headers=headers)
-            response.raise_for_status()
-        except httpx.RequestError as e:
-            print(f"{url=}, {headers=}")
-            print("Request error: ", e)
-            sys.exit(1)
-        except httpx.HTTPStatusError as e:
-            print(f"{url=}, {headers=}")
-            print("HTTP Status error: ", e)
-            sys.exit(1)
+        url = "zones" if not zone_name else f"zones/{zone_name}"
 
-        if zone_name:
-            return response.json()
+        response = await self._request("GET", url)
 
-        return response.json().get("zones")
+        body = orjson.loads(response.content)
+        zones = body if zone_name else body.get("zones")
+        self.zones_cache[zone_name] = (time.monotonic(), zones)
+
+        return zones
 
     async def create_cname_record(
         self, domain_name: str, cname: str, rdata: str
@@ -134,32 +182,21 @@ class DNSUpdater:
             N/A
         """
 
-        url = f"https://api.ultradns.com/zones/{domain_name}./rrsets/cname/{cname}"
+        url = _CNAME_URL(domain_name=domain_name, cname=cname)
         rdata += "."
-        payload = json.dumps({"rdata": [rdata]})
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.key}",
-        }
+        payload = orjson.dumps({"rdata": [rdata]})
+        headers = _JSON_HEADERS
         err_message = f"Creating CNAME record {cname}.{domain_name} Failed, moving to next domain."
 
         try:
-            response = await self.session[self.key].post(
-                url=url, headers=headers, data=payload
+            response = await self._request(
+                "POST", url, headers=headers, content=payload
             )
-            response.raise_for_status()
-        except httpx.RequestError as e:
-            print(f"{url=}, {headers=}, {payload=}")
-            print("Request error: ", e)
-            logger.exception(err_message)
-            return err_message
-        except httpx.HTTPStatusError as e:
-            print(f"{url=}, {headers=}, {payload=}")
-            print("HTTP Status error: ", e)
+        except DCVAPIError:
             logger.exception(err_message)
             return err_message
 
-        if response.json().get("message") != "Successful":
+        if orjson.loads(response.content).get("message") != "Successful":
             return err_message
 
         return "Successful"
@@ -179,24 +216,12 @@ class DNSUpdater:
             N/A
         """
 
-        url = f"https://api.ultradns.com/zones/{domain_name}./rrsets/cname/{cname}"
-        headers = {
-            "Content-Type": "application/x-www-form-urlencoded",
-            "Authorization": f"Bearer {self.key}",
-        }
+        url = _CNAME_URL(domain_name=domain_name, cname=cname)
         err_message = f"Failed to delete cname {cname}.{domain_name}."
 
         try:
-            response = await self.session[self.key].delete(url=url, headers=headers)
-            response.raise_for_status()
-        except httpx.RequestError as e:
-            print(f"{url=}, {headers=}")
-            print("Request error: ", e)
-            logger.exception(err_message)
-            return err_message
-        except httpx.HTTPStatusError as e:
-            print(f"{url=}, {headers=}")
-            print("HTTP Status error: ", e)
+            response = await self._request("DELETE", url)
+        except DCVAPIError:
             logger.exception(err_message)
             return err_message
 
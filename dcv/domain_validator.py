@@ -1,13 +1,250 @@
 """dcv.domain_validator"""
-import json
+import asyncio
+import functools
 import logging
-import sys
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+import random
+from collections import deque
+from datetime import date, timedelta
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
 
 import httpx
+import orjson
 
-logger = logging.getLogger("utils")
+from dcv.errors import DCVAPIError
+from dcv.transport import client_kwargs
+
+logger = logging.getLogger("dcv")
+
+_BASE_URL = "https://www.digicert.com/services/v2/"
+_DOMAINS_URL = "domain"  # URLs are relative to _BASE_URL
+_DOMAIN_STATUS_URL = f"{_DOMAINS_URL}/{{domain_id}}?include_dcv=true".format
+_DCV_METHOD_URL = f"{_DOMAINS_URL}/{{domain_id}}/dcv/method".format
+_VALIDATION_URL = f"{_DOMAINS_URL}/{{domain_id}}/validation".format
+
+_PAGE_SIZE = 1000  # max page size the DigiCert domain listing allows
+_SECRET_HEADERS = frozenset(("x-dc-devkey", "authorization"))  # masked when logged
+# Validation polling backoff, in seconds
+_POLL_DELAY_MIN = 2.0
+_POLL_DELAY_MAX = 30.0
+_MAX_ATTEMPTS = 5  # per request, retried only when DigiCert rate-limits us (429)
+# DigiCert API has rate-limit of 100 calls per 5 seconds
+_RATE_LIMIT_CALLS = 100
+_RATE_LIMIT_PERIOD = 5.0
+
+# Request body never changes, serialize it once
+_SUBMIT_PAYLOAD = orjson.dumps(
+    {
+        "validations": [{"type": "ov"}, {"type": "ev"}],
+        "dcv_method": "dns-cname-token",
+    }
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _dcv_method_payload(dcv_type: str) -> bytes:
+    """
+    Serialize the change_dcv_method request body, once per dcv_type
+
+    Args:
+        dcv_type: type of validation
+
+    Returns:
+        json request body
+
+    Raises:
+        N/A
+    """
+    return orjson.dumps({"dcv_method": dcv_type})
+
+
+def _redacted(headers: Dict[str, str]) -> Dict[str, str]:
+    """
+    Copy of headers that is safe to log, API keys and tokens masked
+
+    Args:
+        headers: request headers
+
+    Returns:
+        Dict of headers
+
+    Raises:
+        N/A
+    """
+    return {
+        name: "***" if name.lower() in _SECRET_HEADERS else value
+        for name, value in headers.items()
+    }
+
+
+def _domain_filters(domain_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build the query parameters for the DigiCert domain listing
+
+    Args:
+        domain_name: optional fqdn, only return this domain
+
+    Returns:
+        Dict of query parameters
+
+    Raises:
+        N/A
+    """
+    params: Dict[str, Any] = {}
+    if domain_name:
+        params["filters[search]"] = domain_name
+
+    return params
+
+
+def _is_expiring(domain: Dict[str, Any], exp_date_str: str) -> bool:
+    """
+    Check if the domain's earliest (ov/ev) validation expires on or before exp_date_str
+
+    Args:
+        domain: domain api object
+        exp_date_str: cutoff date, formatted as YYYY-MM-DD
+
+    Returns:
+        true/false, domains that were never validated count as expiring
+
+    Raises:
+        N/A
+    """
+    dcv_expiration = domain.get("dcv_expiration")  # Some domains don't have this
+
+    if not dcv_expiration:
+        message = (
+            f"Info: No expiration, domain has likely never been validated, "
+            f"Use dcv validate -d {domain['name']} "
+            "to manually validate if desired."
+        )
+        print(message)
+        logger.info(message)
+        return True
+
+    # YYYY-MM-DD strings sort the same as the dates they represent, skip parsing them
+    return min(dcv_expiration["ev"], dcv_expiration["ov"]) <= exp_date_str
+
+
+def _is_validated(validations: List[Dict[str, Any]]) -> bool:
+    """
+    Check if both the ov and ev validations are complete and active
+
+    Args:
+        validations: domain validations from api, ov first then ev
+
+    Returns:
+        true/false
+
+    Raises:
+        N/A
+    """
+    valid_ov = validations[0]["status"]
+    valid_ov_dcv = validations[0]["dcv_status"]
+    valid_ev = validations[1]["status"]
+    valid_ev_dcv = validations[1]["dcv_status"]
+
+    return (
+        valid_ov_dcv == "complete"
+        and valid_ev_dcv == "complete"
+        and valid_ov == "active"
+        and valid_ev == "active"
+    )
+
+
+def _status_code(error: DCVAPIError) -> Optional[int]:
+    """
+    HTTP status code behind a DCVAPIError, if it came from an error response
+
+    Args:
+        error: raised DCVAPIError
+
+    Returns:
+        status code or None
+
+    Raises:
+        N/A
+    """
+    cause = error.__cause__
+    if isinstance(cause, httpx.HTTPStatusError):
+        return cause.response.status_code
+
+    return None
+
+
+def _retry_after(error: Exception, default: float) -> float:
+    """
+    Seconds to wait per the Retry-After header of a rate-limited response
+
+    Args:
+        error: raised DCVAPIError, or the httpx.HTTPStatusError behind it
+        default: seconds to wait if there's no usable Retry-After header
+
+    Returns:
+        seconds to wait
+
+    Raises:
+        N/A
+    """
+    cause = error if isinstance(error, httpx.HTTPStatusError) else error.__cause__
+    if not isinstance(cause, httpx.HTTPStatusError):
+        return default
+
+    try:
+        return float(cause.response.headers.get("Retry-After", default))
+    except ValueError:  # HTTP-date form, not worth parsing
+        return default
+
+
+class _RateLimiter:
+    """At most `calls` requests in any `period` seconds, callers wait their turn"""
+
+    def __init__(self, calls: int, period: float) -> None:
+        """
+        Instance of _RateLimiter
+
+        Args:
+            calls: max number of requests per period
+            period: length of the sliding window, in seconds
+
+        Returns:
+            None/Class Instance
+
+        Raises:
+            N/A
+        """
+        self.calls = calls
+        self.period = period
+        # Event loop times of the requests sent within the last period
+        self.sent: Deque[float] = deque()
+        self.lock: Optional[asyncio.Lock] = None  # Needs the running event loop
+
+    async def acquire(self) -> None:
+        """
+        Wait until another request fits in the window, and count it
+
+        Args:
+            N/A
+
+        Returns:
+            None
+
+        Raises:
+            N/A
+        """
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+
+        async with self.lock:  # One waiter at a time, in arrival order
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            while self.sent and now - self.sent[0] >= self.period:
+                self.sent.popleft()
+            if len(self.sent) >= self.calls:
+                await asyncio.sleep(self.sent[0] + self.period - now)
+                self.sent.popleft()
+                now = loop.time()
+            self.sent.append(now)
 
 
 class DomainValidator:
@@ -28,12 +265,48 @@ class DomainValidator:
         """
         self.key = key
         self.headers = {"X-DC-DEVKEY": self.key, "Content-Type": "application/json"}
-        self.session = {}
-        sess = httpx.AsyncClient()
-        self.session[self.key] = sess
+        self._client = httpx.AsyncClient(
+            **client_kwargs(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=200,
+                    max_keepalive_connections=100,
+                    keepalive_expiry=60.0,
+                ),
+            ),
+            base_url=_BASE_URL,
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            headers=self.headers,
+        )
+        self.rate_limiter = _RateLimiter(_RATE_LIMIT_CALLS, _RATE_LIMIT_PERIOD)
+
+    async def __aenter__(self) -> "DomainValidator":
+        """Async context manager entry, returns this instance"""
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Async context manager exit, closes the http client"""
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Close the underlying http client and release its pooled connections
+
+        Args:
+            N/A
+
+        Returns:
+            None
+
+        Raises:
+            N/A
+        """
+        await self._client.aclose()
 
     async def get_domains(
-        self, limit: Optional[int] = None, domain_name: Optional[str] = None
+        self,
+        limit: Optional[int] = None,
+        domain_name: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
         Retrieve all domains and return list of domains expiring within num_days
@@ -46,32 +319,137 @@ class DomainValidator:
             List of DigiCert domains in json
 
         Raises:
-            N/A
+            DCVAPIError: API request failed
         """
 
-        url = (
-            "https://www.digicert.com/services/v2/domain"
-            if not domain_name and not limit
-            else f"https://www.digicert.com/services/v2/domain?filters[search]={domain_name}"
-            if not limit
-            else f"https://www.digicert.com/services/v2/domain?limit={str(limit)}"
-        )
+        if limit:
+            params = _domain_filters(domain_name=domain_name)
+            params["limit"] = limit
+            return (await self._get_domains_page(params=params)).get("domains") or []
+
+        return [domain async for domain in self.iter_domains(domain_name=domain_name)]
+
+    async def iter_domains(
+        self,
+        domain_name: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield every domain, one at a time, as the listing pages arrive
+
+        The first request learns the total, the remaining pages are then
+        fetched concurrently and yielded in whatever order they complete. If one
+        fails, the pages still in flight are cancelled.
+
+        Args:
+            domain_name: optional fqdn, only return this domain
+
+        Returns:
+            Async iterator of DigiCert domains in json
 
+        Raises:
+            DCVAPIError: API request failed
+        """
+
+        params = _domain_filters(domain_name=domain_name)
+        params["limit"] = _PAGE_SIZE
+
+        body = await self._get_domains_page(params={**params, "offset": 0})
+        for domain in body.get("domains") or []:
+            yield domain
+
+        page_info = body.get("page", {})
+        total = page_info.get("total", 0)
+        # Step by the page size DigiCert actually used, it may cap what we asked for
+        page_size = page_info.get("limit") or _PAGE_SIZE
+        pages = [
+            asyncio.ensure_future(
+                self._get_domains_page(params={**params, "offset": offset})
+            )
+            for offset in range(page_size, total, page_size)
+        ]
         try:
-            response = await self.session[self.key].get(url=url, headers=self.headers)
-            response.raise_for_status()
-        except httpx.RequestError as e:
-            print(f"{url=}, {self.headers=}")
-            print("Request error: ", e)
-            sys.exit(1)
-        except httpx.HTTPStatusError as e:
-            print(f"{url=}, {self.headers=}")
-            print("HTTP Status error: ", e)
-            sys.exit(1)
+            for next_page in asyncio.as_completed(pages):
+                for domain in (await next_page).get("domains") or []:
+                    yield domain
+        finally:  # A page failed or the caller stopped early, don't leave the rest running
+            for page in pages:
+                page.cancel()
+            await asyncio.gather(*pages, return_exceptions=True)
+
+    async def _request(
+        self, method: str, url: str, max_attempts: int = _MAX_ATTEMPTS, **kwargs: Any
+    ) -> httpx.Response:
+        """
+        Send a request to the DigiCert API, retrying when rate-limited
+
+        Requests are paced to DigiCert's rate-limit (see _RateLimiter). A 429 is
+        still retried up to max_attempts times, waiting as long as its
+        Retry-After header asks (or backing off with jitter without one).
+
+        Args:
+            method: HTTP method
+            url: URL, relative to the DigiCert API base
+            max_attempts: 1 leaves backing off from a 429 to the caller
+            kwargs: passed through to httpx.AsyncClient.request
+
+        Returns:
+            httpx.Response, successful (2xx)
+
+        Raises:
+            DCVAPIError: API request failed
+        """
+        delay = _POLL_DELAY_MIN
+        attempt = 1
+        while True:
+            await self.rate_limiter.acquire()
+            try:
+                response = await self._client.request(method, url, **kwargs)
+                response.raise_for_status()
+                return response
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 429 and attempt < max_attempts:
+                    wait = _retry_after(e, default=delay + random.uniform(0, delay))
+                    logger.warning("Rate-limited by DigiCert, retrying in %ss.", wait)
+                    await asyncio.sleep(wait)
+                    delay *= 2
+                    attempt += 1
+                    continue
+                error: httpx.HTTPError = e
+            except httpx.RequestError as e:
+                error = e
+
+            logger.debug(
+                "Request failed: method=%s url=%s params=%s headers=%s",
+                method,
+                url,
+                kwargs.get("params"),
+                _redacted(self.headers),
+            )
+            logger.error("%s %s failed: %s", method, error.request.url, error)
+            raise DCVAPIError(f"{error.request.url}: {error}") from error
+
+    async def _get_domains_page(
+        self, params: Dict[str, Any], max_attempts: int = _MAX_ATTEMPTS
+    ) -> Dict[str, Any]:
+        """
+        Retrieve a single page of the domain listing
+
+        Args:
+            params: query parameters (filters, limit, offset)
+            max_attempts: see _request
+
+        Returns:
+            Response body in json
 
-        domains = response.json().get("domains")
+        Raises:
+            DCVAPIError: API request failed
+        """
+
+        response = await self._request(
+            "GET", _DOMAINS_URL, max_attempts=max_attempts, params=params
+        )
 
-        return domains
+        return orjson.loads(response.content)
 
     async def get_expiring_domains(
         self,
@@ -89,38 +467,20 @@ class DomainValidator:
             List[Dict] (digicert domains in json)
 
         Raises:
-            N/A
+            DCVAPIError: API request failed
         """
 
-        domains = await self.get_domains() if not domains else domains
-
-        exp_date = datetime.now() + timedelta(num_days)  # expires 180 days from now
-        exp_domains = []
-
-        for domain in domains:
-            dcv_expiration = domain.get(
-                "dcv_expiration"
-            )  # Some domains don't have this
-
-            if dcv_expiration:
-                ev_exp_str = dcv_expiration["ev"]
-                ov_exp_str = dcv_expiration["ov"]
-            else:
-                message = (
-                    f"Info: No expiration, domain has likely never been validated, "
-                    f"Use dcv validate -d {domain['name']} "
-                    "to manually validate if desired."
-                )
-                print(message)
-                logger.info(message)
-                exp_domains.append(domain)
-                continue
+        exp_date = date.today() + timedelta(days=num_days)  # expires 90 days from now
+        exp_date_str = exp_date.isoformat()
 
-            ev_exp = datetime.strptime(ev_exp_str, "%Y-%m-%d")
-            ov_exp = datetime.strptime(ov_exp_str, "%Y-%m-%d")
-            min_exp = ev_exp if ev_exp < ov_exp else ov_exp  # Get lowest date
+        if domains is not None:
+            return [domain for domain in domains if _is_expiring(domain, exp_date_str)]
 
-            if min_exp < exp_date:
+        # Filter while the pages stream in. Not server-side (filters[valid_till]),
+        # never validated domains have no expiration and must still be reported.
+        exp_domains = []
+        async for domain in self.iter_domains():
+            if _is_expiring(domain, exp_date_str):
                 exp_domains.append(domain)
 
         return exp_domains
@@ -136,25 +496,14 @@ class DomainValidator:
             dcv_status and expiration date (ov only)
 
         Raises:
-            N/A
+            DCVAPIError: API request failed
         """
-        url = f"https://www.digicert.com/services/v2/domain/{domain['id']}?include_dcv=true"
+        url = _DOMAIN_STATUS_URL(domain_id=domain["id"])
 
-        try:
-            response = await self.session[self.key].get(url=url, headers=self.headers)
-            response.raise_for_status()
-        except httpx.RequestError as e:
-            print(f"{url=}, {self.headers=}")
-            print("Request error: ", e)
-            sys.exit(1)
-        except httpx.HTTPStatusError as e:
-            print(f"{url=}, {self.headers=}")
-            print("HTTP Status error: ", e)
-            sys.exit(1)
-
-        dcv_expiration = response.json().get(
-            "dcv_expiration"
-        )  # Some domains don't have this
+        response = await self._request("GET", url)
+        body = orjson.loads(response.content)
+
+        dcv_expiration = body.get("dcv_expiration")  # Some domains don't have this
 
         if not dcv_expiration:
             return (
@@ -164,7 +513,7 @@ class DomainValidator:
 
         ov_exp = dcv_expiration["ov"]
 
-        validations = response.json().get("validations")
+        validations = body.get("validations")
         if not validations:
             return "Failed", f"Failed to retrieve validations from {domain['name']}"
         ov_status = validations[0]["status"]
@@ -174,7 +523,7 @@ class DomainValidator:
         return dcv_status, ov_exp
 
     async def change_dcv_method(
-        self, domain: Dict[str, Any], dcv_type: str = "dns‑cname‑token"
+        self, domain: Dict[str, Any], dcv_type: str = "dns-cname-token"
     ) -> Tuple[str, str]:
         """
         Update Domain Control Validation method to `dcv_type`
@@ -189,37 +538,25 @@ class DomainValidator:
         Raises:
             N/A
         """
-        url = f"https://www.digicert.com/services/v2/domain/{domain['id']}/dcv/method"
-        payload = json.dumps({"dcv_method": dcv_type})
+        url = _DCV_METHOD_URL(domain_id=domain["id"])
+        payload = _dcv_method_payload(dcv_type)
         err_message = (
             "Failed",
             f"API Error getting DCV values from domain {domain['name']}",
         )
 
         try:
-            response = await self.session[self.key].put(
-                url=url, headers=self.headers, data=payload
-            )
-            response.raise_for_status()
-        except httpx.RequestError as e:
-            print(f"{url=}, {self.headers=}")
-            print("Request error: ", e)
-            logger.exception(err_message)
-            return err_message
-        except httpx.HTTPStatusError as e:
-            print(f"{url=}, {self.headers=}")
-            print("HTTP Status error: ", e)
-            logger.exception(err_message)
+            response = await self._request("PUT", url, content=payload)
+        except DCVAPIError:
+            logger.exception(err_message[1])
             return err_message
 
-            # Actual token values
-        if not response.json().get("dcv_token"):
+        # Actual token values
+        dcv_token = orjson.loads(response.content).get("dcv_token")
+        if not dcv_token:
             return err_message
 
-        token = response.json()["dcv_token"]["token"]
-        verification_value = response.json()["dcv_token"]["verification_value"]
-
-        return token, verification_value
+        return dcv_token["token"], dcv_token["verification_value"]
 
     async def submit_for_validation(self, domain: Dict[str, Any]) -> Tuple[str, str]:
         """
@@ -236,40 +573,27 @@ class DomainValidator:
         Raises:
             N/A
         """
-        url = f"https://www.digicert.com/services/v2/domain/{domain['id']}/validation"
-        payload = json.dumps(
-            {
-                "validations": [{"type": "ov"}, {"type": "ev"}],
-                "dcv_method": "dns-cname-token",
-            }
-        )
+        url = _VALIDATION_URL(domain_id=domain["id"])
+        payload = _SUBMIT_PAYLOAD
         err_message = (
             "Failed",
             f"Failed to submit {domain['name']} for validation.",
         )
 
         try:
-            response = await self.session[self.key].post(
-                url=url, headers=self.headers, data=payload
-            )
-            response.raise_for_status()
-        except httpx.RequestError as e:
-            print(f"{url=}, {self.headers=}")
-            print("Request error: ", e)
-            logger.exception(err_message)
+            response = await self._request("POST", url, content=payload)
+        except DCVAPIError:
+            logger.exception(err_message[1])
             return err_message
-        except httpx.HTTPStatusError as e:
-            print(f"{url=}, {self.headers=}")
-            print("HTTP Status error: ", e)
-            logger.exception(err_message)
+
+        if response.status_code != 201:
             return err_message
 
-        if response.status_code != 201 or not response.json().get("dcv_token"):
+        dcv_token = orjson.loads(response.content).get("dcv_token")
+        if not dcv_token:
             return err_message
 
-        token = response.json()["dcv_token"]["token"]
-        verification_value = response.json()["dcv_token"]["verification_value"]
-        return token, verification_value
+        return dcv_token["token"], dcv_token["verification_value"]
 
     async def check_for_validation(self, domain: Dict[str, Any]) -> bool:
         """
@@ -285,37 +609,114 @@ class DomainValidator:
             N/A
         """
 
-        url = f"https://www.digicert.com/services/v2/domain/{domain['id']}/validation"
+        url = _VALIDATION_URL(domain_id=domain["id"])
         try:
-            response = await self.session[self.key].get(url=url, headers=self.headers)
-            response.raise_for_status()
-        except httpx.RequestError as e:
-            print(f"{url=}, {self.headers=}")
-            print("Request error: ", e)
-            logger.exception(f"Check for Validation failed on domain {domain['name']}.")
-            return False
-        except httpx.HTTPStatusError as e:
-            print(f"{url=}, {self.headers=}")
-            print("HTTP Status error: ", e)
+            response = await self._request("GET", url)
+        except DCVAPIError:
             logger.exception(f"Check for Validation failed on domain {domain['name']}.")
             return False
 
-        validations = response.json().get("validations")
+        validations = orjson.loads(response.content).get("validations")
         if not validations:
             logger.exception(f"Check for Validation failed on domain {domain['name']}.")
             return False
 
-        valid_ov = validations[0]["status"]
-        valid_ov_dcv = validations[0]["dcv_status"]
-        valid_ev = validations[1]["status"]
-        valid_ev_dcv = validations[1]["dcv_status"]
+        return _is_validated(validations)
+
+    async def check_for_validation_bulk(self, domain_ids: List[int]) -> Dict[int, bool]:
+        """
+        Check many domains for validation, one domain listing call per _PAGE_SIZE ids
+
+        Args:
+            domain_ids: ids of the domains to check
+
+        Returns:
+            Dict of domain id: true/false, domains that couldn't be checked are false
+
+        Raises:
+            DCVAPIError: DigiCert is rate-limiting us (429), caller should back off
+        """
+
+        validated = {domain_id: False for domain_id in domain_ids}
+        for start in range(0, len(domain_ids), _PAGE_SIZE):
+            batch = domain_ids[start : start + _PAGE_SIZE]
+            params = {
+                "filters[id]": ",".join(str(domain_id) for domain_id in batch),
+                "include_validation": "true",
+                "limit": _PAGE_SIZE,
+            }
+            try:
+                # No retries here, iter_validation backs off within its timeout
+                body = await self._get_domains_page(params=params, max_attempts=1)
+            except DCVAPIError as e:
+                if _status_code(e) == 429:
+                    raise
+                logger.exception(f"Check for Validation failed on domains {batch}.")
+                continue
+
+            for domain in body.get("domains") or []:
+                validations = domain.get("validations")
+                if domain.get("id") in validated and validations:
+                    validated[domain["id"]] = _is_validated(validations)
+
+        return validated
+
+    async def iter_validation(
+        self, domains: List[Dict[str, Any]], timeout: int = 240
+    ) -> AsyncIterator[Tuple[int, bool]]:
+        """
+        Yield each domain as soon as it's validated, one check call per attempt for all
+
+        Checks with exponential backoff (plus jitter) for up to timeout seconds,
+        domains drop out of the check as soon as they're validated. If DigiCert
+        rate-limits us, wait as long as its Retry-After header asks instead.
+        Domains still not validated when time runs out are yielded last.
+
+        Args:
+            domains: domains submitted for validation
+            timeout: length of timeout (in seconds) on validation check
+
+        Returns:
+            Async iterator of (domain id, validated true/false)
+
+        Raises:
+            N/A
+        """
+        pending = [domain["id"] for domain in domains]
+
+        if pending and timeout:
+            print("Beginning check validation period, please wait..")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = _POLL_DELAY_MIN
+        attempts = 1
+
+        while pending and timeout:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                message = "Giving up on remaining domains after too many retries. "
+                print(message)
+                logger.warning(message)
+                break
+            await asyncio.sleep(min(delay + random.uniform(0, 0.3 * delay), remaining))
+
+            logger.info(
+                f"Checking {len(pending)} domain(s) for validation, attempt #{attempts}."
+            )
+            attempts += 1
+            try:
+                validated = await self.check_for_validation_bulk(pending)
+            except DCVAPIError as e:
+                delay = _retry_after(e, default=min(delay * 2, _POLL_DELAY_MAX))
+                logger.warning("Rate-limited by DigiCert, retrying in %ss.", delay)
+                continue
+
+            pending = [domain_id for domain_id in pending if not validated[domain_id]]
+            for domain_id, valid in validated.items():
+                if valid:
+                    yield domain_id, True
 
-        if (
-            valid_ov_dcv == "complete"
-            and valid_ev_dcv == "complete"
-            and valid_ov == "active"
-            and valid_ev == "active"
-        ):
-            return True
+            delay = min(delay * 2, _POLL_DELAY_MAX)
 
-        return False
+        for domain_id in pending:
+            yield domain_id, False
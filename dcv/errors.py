@@ -0,0 +1,5 @@
+"""dcv.errors"""
+
+
+class DCVAPIError(RuntimeError):
+    """DigiCert or Neustar/UltraDNS API call failed"""
@@ -0,0 +1,159 @@
+"""dcv.transport"""
+import inspect
+import ipaddress
+import logging
+import socket
+import time
+import urllib.request
+from typing import Any, Dict, Optional, Tuple
+
+import aiodns
+import httpx
+
+logger = logging.getLogger("dcv")
+
+_DNS_CACHE_TTL = 300.0  # seconds, upper bound on how long a resolved address is reused
+
+
+class CachingResolverTransport(httpx.AsyncHTTPTransport):
+    """httpx transport resolving hostnames with aiodns, answers cached in memory"""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Instance of CachingResolverTransport, takes the httpx.AsyncHTTPTransport arguments
+
+        Args:
+            args: passed through to httpx.AsyncHTTPTransport
+            kwargs: passed through to httpx.AsyncHTTPTransport
+
+        Returns:
+            None/Class Instance
+
+        Raises:
+            N/A
+        """
+        super().__init__(*args, **kwargs)
+        self.addresses: Dict[str, Tuple[str, float]] = {}
+        self.resolver: Optional[aiodns.DNSResolver] = None
+
+    async def resolve(self, host: str) -> Optional[str]:
+        """
+        Resolve host to an IPv4 address, reusing the cached answer while it's fresh
+
+        Args:
+            host: hostname to resolve
+
+        Returns:
+            IP address, or None if it couldn't be resolved (httpx then resolves it itself)
+
+        Raises:
+            N/A
+        """
+        now = time.monotonic()
+        cached = self.addresses.get(host)
+        if cached and cached[1] > now:
+            return cached[0]
+
+        if self.resolver is None:  # Needs the running event loop, so create lazily
+            self.resolver = aiodns.DNSResolver()
+        try:
+            result = await self.resolver.getaddrinfo(
+                host, family=socket.AF_INET, type=socket.SOCK_STREAM
+            )
+        except aiodns.error.DNSError as e:
+            logger.debug("aiodns could not resolve %s: %s", host, e)
+            return None
+        if not result.nodes:
+            return None
+
+        node = result.nodes[0]
+        address = node.addr[0]
+        if isinstance(address, bytes):
+            address = address.decode()
+        ttl = min(node.ttl, _DNS_CACHE_TTL) if node.ttl > 0 else _DNS_CACHE_TTL
+        self.addresses[host] = (address, now + ttl)
+
+        return address
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """
+        Send the request to the resolved address, keeping Host header and TLS on the hostname
+
+        Args:
+            request: outgoing request
+
+        Returns:
+            httpx.Response
+
+        Raises:
+            N/A
+        """
+        host = request.url.host
+        try:
+            ipaddress.ip_address(host)
+            address = None  # Already an IP address, nothing to resolve
+        except ValueError:
+            address = await self.resolve(host)
+
+        if address:
+            request = httpx.Request(
+                method=request.method,
+                url=request.url.copy_with(host=address),
+                headers=request.headers,  # Host header still carries the hostname
+                stream=request.stream,
+                extensions={**request.extensions, "sni_hostname": host},
+            )
+
+        return await super().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """
+        Close the connection pool and the aiodns resolver
+
+        Args:
+            N/A
+
+        Returns:
+            None
+
+        Raises:
+            N/A
+        """
+        await super().aclose()
+        if self.resolver is None:
+            return
+
+        close = getattr(self.resolver, "close", None)
+        if close is None:  # aiodns without close(), just stop pending queries
+            self.resolver.cancel()
+        else:
+            result = close()  # a coroutine from aiodns 4 on
+            if inspect.isawaitable(result):
+                await result
+        self.resolver = None
+
+
+def client_kwargs(http2: bool, limits: httpx.Limits) -> Dict[str, Any]:
+    """
+    Build the transport arguments for an httpx.AsyncClient
+
+    A custom transport makes httpx ignore HTTP(S)_PROXY/ALL_PROXY, and a proxy
+    can't be handed a raw IP anyway, so keep httpx's own transport when a proxy
+    is configured in the environment.
+
+    Args:
+        http2: enable HTTP/2
+        limits: connection pool limits
+
+    Returns:
+        Dict of httpx.AsyncClient keyword arguments
+
+    Raises:
+        N/A
+    """
+    # Same lookup httpx does for trust_env
+    proxies = urllib.request.getproxies()
+    if any(proxies.get(scheme) for scheme in ("http", "https", "all")):
+        return {"http2": http2, "limits": limits}
+
+    return {"transport": CachingResolverTransport(http2=http2, limits=limits)}
@@ -1,25 +1,56 @@
 """dcv.utils"""
 import asyncio
 import logging
+import os
 import sys
+import threading
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from datetime import date
+from logging.handlers import RotatingFileHandler
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 
 from dcv.dns_updater import DNSUpdater
 from dcv.domain_validator import DomainValidator
 
-# Logging
-logger = logging.getLogger("utils")
+# DigiCert API has rate-limit of 100 calls per 5 seconds, domains being set up at once
+DEFAULT_CONCURRENCY = 32
+
+# Logging, dcv.log is only set up once a command runs (see _init_logging)
+logger = logging.getLogger("dcv")
 logger.setLevel(logging.INFO)
-formatter = logging.Formatter("%(asctime)s:%(levelname)s:%(message)s")
-try:
-    file_handler = logging.FileHandler("dcv.log")
-except PermissionError:
-    print("Permission denied creating dcv.log, check folder permissions.")
-    sys.exit(1)
-file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
+
+
+def _init_logging() -> None:
+    """
+    Attach the dcv.log file handler to the dcv logger, only the first time
+
+    Args:
+        N/A
+
+    Returns:
+        None
+
+    Raises:
+        SystemExit: dcv.log can't be written
+    """
+    if any(isinstance(handler, RotatingFileHandler) for handler in logger.handlers):
+        return
+
+    # Opened on the first record, so check up front that it can be written
+    file_handler = RotatingFileHandler(
+        "dcv.log", maxBytes=10 * 1024 * 1024, backupCount=5, encoding="utf8", delay=True
+    )
+    if not os.access(os.path.dirname(file_handler.baseFilename), os.W_OK) or (
+        os.path.exists(file_handler.baseFilename)
+        and not os.access(file_handler.baseFilename, os.W_OK)
+    ):
+        print("Permission denied creating dcv.log, check folder permissions.")
+        sys.exit(1)
+    file_handler.setFormatter(
+        logging.Formatter("%(asctime)s:%(levelname)s:%(message)s")
+    )
+    logger.addHandler(file_handler)
 
 
 @dataclass
@@ -30,6 +61,135 @@ class DCVResponse:
     valid: bool
     cleanup: bool
     message: str
+    cname: Optional[str] = None
+
+
+def _settle_answer(
+    answer: "asyncio.Future[str]",
+    result: Optional[str],
+    error: Optional[BaseException],
+) -> None:
+    """
+    Hand what input() returned (or raised) to the coroutine waiting in ask()
+
+    Runs on the event loop, scheduled by _read_answer.
+
+    Args:
+        answer: future ask() is waiting on
+        result: line the user entered, None if input() raised
+        error: exception input() raised, None if it returned
+
+    Returns:
+        None
+
+    Raises:
+        N/A
+    """
+    if answer.done():  # Abandoned (cancelled) while the user was typing
+        return
+    if error is not None:
+        answer.set_exception(error)
+    else:
+        answer.set_result(result or "")
+
+
+def _read_answer(
+    prompt: str, loop: asyncio.AbstractEventLoop, answer: "asyncio.Future[str]"
+) -> None:
+    """
+    Read a line with input() and pass it back to the event loop
+
+    Runs in ask()'s daemon thread.
+
+    Args:
+        prompt: text to show the user
+        loop: event loop ask() is running on
+        answer: future ask() is waiting on
+
+    Returns:
+        None
+
+    Raises:
+        N/A
+    """
+    try:
+        result, error = input(prompt), None
+    except BaseException as e:  # pylint: disable=broad-except
+        result, error = None, e
+    try:
+        loop.call_soon_threadsafe(_settle_answer, answer, result, error)
+    except RuntimeError:  # Event loop already closed, nobody is waiting
+        pass
+
+
+async def ask(prompt: str) -> str:
+    """
+    Read a line from the user without blocking the event loop
+
+    input() runs in a daemon thread rather than the default executor, so
+    Ctrl-C can abandon it, asyncio.run would wait on an executor thread forever.
+
+    Args:
+        prompt: text to show the user
+
+    Returns:
+        the user's answer
+
+    Raises:
+        EOFError: stdin was closed
+    """
+    loop = asyncio.get_running_loop()
+    answer: "asyncio.Future[str]" = loop.create_future()
+
+    threading.Thread(
+        target=_read_answer,
+        args=(prompt, loop, answer),
+        name="dcv-prompt",
+        daemon=True,
+    ).start()
+    return await answer
+
+
+@asynccontextmanager
+async def digicert_client(key: str) -> AsyncIterator[DomainValidator]:
+    """
+    Open the DigiCert client, shared by every step of a read-only command
+
+    Args:
+        key: DigiCert API Key
+
+    Returns:
+        DomainValidator, closed on exit
+
+    Raises:
+        N/A
+    """
+    async with DomainValidator(key=key) as dv_obj:
+        yield dv_obj
+
+
+@asynccontextmanager
+async def clients(
+    key: str, username: str, password: str
+) -> AsyncIterator[Tuple[DomainValidator, DNSUpdater]]:
+    """
+    Open the DigiCert and Neustar/UltraDNS clients, shared by every step of a command
+
+    Args:
+        key: DigiCert API Key
+        username: Neustar/UltraDNS Username
+        password: Neustar/UltraDNS Password
+
+    Returns:
+        Tuple of DomainValidator and logged in DNSUpdater, closed on exit
+
+    Raises:
+        DCVAPIError: Neustar/UltraDNS login failed
+    """
+    async with digicert_client(key=key) as dv_obj:
+        async with DNSUpdater(username=username, password=password) as dns_obj:
+            await dns_obj.login()
+            yield dv_obj, dns_obj
 
 
 def print_final_results(results: List[DCVResponse]) -> None:
@@ -83,17 +243,17 @@ def print_expiring_domains(domains: List[Dict[str, Any]]) -> None:
             try:
                 ov_exp = domain["dcv_expiration"]["ov"]
                 ev_exp = domain["dcv_expiration"]["ev"]
-                ev_exp_d = datetime.strptime(ev_exp, "%Y-%m-%d")
-                ov_exp_d = datetime.strptime(ov_exp, "%Y-%m-%d")
-                exp_date_d = (
-                    ev_exp_d if ev_exp_d < ov_exp_d else ov_exp_d
-                )  # Get lowest date
-                print(f"{domain['name']:<30} {f'Expiration: {exp_date_d.date()}':>30}")
+                exp_date_d = min(  # Get lowest date
+                    date.fromisoformat(ev_exp), date.fromisoformat(ov_exp)
+                )
+                print(f"{domain['name']:<30} {f'Expiration: {exp_date_d}':>30}")
             except KeyError:
-                print(f"{domain['name']:<30} No expiration found, must be a new domain.")
+                print(
+                    f"{domain['name']:<30} No expiration found, must be a new domain."
+                )
 
 
-def read_domains_from_file(filename: str) -> Dict[str, None]:
+def read_domains_from_file(filename: str) -> Set[str]:
     """
     Read domain list from a file, one fqdn per line
 
@@ -101,14 +261,14 @@ def read_domains_from_file(filename: str) -> Dict[str, None]:
         filename: filename or path to filename
 
     Returns:
-        Dict of domain names as key
+        Set of domain names
 
     Raises:
         N/A
     """
     try:
         with open(filename, "r", encoding="utf8") as fin:
-            domains = {d.rstrip("\n"): None for d in fin.readlines() if d != "\n"}
+            domains = {line.strip() for line in fin if line.strip()}
     except IOError as e:
         print(f"Error loading file: {filename}:")
         print(e)
@@ -135,19 +295,15 @@ async def get_domains_from_file(
         N/A
     """
     all_domains = await dv_obj.get_domains()
-    domains = []
     domain_names = read_domains_from_file(filename)
 
-    # Loop through and build list of domains that actually exist
-    for domain in all_domains:
-        fqdn = domain["name"]
-        if fqdn in domain_names:
-            domains.append(domain)
-            domain_names.pop(fqdn)  # We found it, don't look for it again
+    # Build list of domains that actually exist
+    domains = [domain for domain in all_domains if domain["name"] in domain_names]
 
     # Print anything not found
-    if domain_names:
-        for domain in domain_names:
+    missing = domain_names - {domain["name"] for domain in domains}
+    if missing:
+        for domain in sorted(missing):
             message = f"Warning: domain {domain} not found! Check spelling."
             print(message)
             logger.warning(message)
@@ -170,13 +326,14 @@ async def check_single(key: str, domain_name: str) -> None:
     Raises:
         N/A
     """
-    dv_obj = DomainValidator(key=key)
-    domain = await dv_obj.get_domains(domain_name=domain_name)
-    if not domain:
-        print(f"Error: Domain {domain_name} not found, exiting...")
-        sys.exit(1)
+    _init_logging()
+    async with digicert_client(key=key) as dv_obj:
+        domain = await dv_obj.get_domains(domain_name=domain_name)
+        if not domain:
+            print(f"Error: Domain {domain_name} not found, exiting...")
+            sys.exit(1)
 
-    dcv_status, exp_date = await dv_obj.get_domain_status(domain=domain[0])
+        dcv_status, exp_date = await dv_obj.get_domain_status(domain=domain[0])
 
     if dcv_status == "Failed":
         print(f"Error retrieving status on domain {domain_name}")
@@ -201,9 +358,10 @@ async def check(key: str, num_days: int = 90) -> None:
     Raises:
         N/A
     """
-    dv_obj = DomainValidator(key=key)
-    # Get all domains expiring 'soon'
-    domains = await dv_obj.get_expiring_domains(num_days=num_days)
+    _init_logging()
+    async with digicert_client(key=key) as dv_obj:
+        # Get all domains expiring 'soon'
+        domains = await dv_obj.get_expiring_domains(num_days=num_days)
 
     # Output
     print("\nList of Domains expiring soon:\n")
@@ -211,7 +369,12 @@ async def check(key: str, num_days: int = 90) -> None:
 
 
 async def validate_single(
-    key: str, username: str, password: str, domain_name: str, timeout: int
+    key: str,
+    username: str,
+    password: str,
+    domain_name: str,
+    timeout: int,
+    assume_yes: bool = False,
 ) -> None:
     """
     Validate a single domain
@@ -222,6 +385,7 @@ async def validate_single(
         password: Neustar/UltraDNS Password
         domain_name: fqdn of the domain
         timeout: How many seconds to wait/check for validation
+        assume_yes: don't ask for confirmation before validating
 
     Returns:
         None
@@ -229,40 +393,53 @@ async def validate_single(
     Raises:
         N/A
     """
-    dv_obj = DomainValidator(key=key)
-    dns_obj = DNSUpdater(username=username, password=password)
-    await dns_obj.login()
-
-    # Validate this single domain (DigiCert) exists
-    domain = await dv_obj.get_domains(domain_name=domain_name)
-    if not domain:  # Grab only the domain out of the list
-        print(f"\nDomain {domain_name} not found in DigiCert, exiting..\n")
-        sys.exit(1)
-
-    # Validate zone (dns) exists, domain is List so use first(only) item in list
-    zone = await dns_obj.get_zones(domain[0]["name"])
-    if not zone:
-        print(f"\nDNS Zone{zone} not found in UltraDNS, exiting...\n")
-        sys.exit(1)
-
-    # Async validate one domains!
-    await runall(
-        key=key,
-        username=username,
-        password=password,
-        expiring_domains=domain,
-        timeout=timeout,
-    )
+    _init_logging()
+    async with clients(key=key, username=username, password=password) as (
+        dv_obj,
+        dns_obj,
+    ):
+        # Look the domain (DigiCert) and its zone (dns) up at the same time
+        lookups = await asyncio.gather(
+            dv_obj.get_domains(domain_name=domain_name),
+            dns_obj.get_zones(domain_name),
+            return_exceptions=True,
+        )
+        domain, zone = lookups
+
+        # Validate this single domain (DigiCert) exists
+        if isinstance(domain, BaseException):
+            raise domain
+        if not domain:  # Grab only the domain out of the list
+            print(f"\nDomain {domain_name} not found in DigiCert, exiting..\n")
+            sys.exit(1)
+
+        # Validate zone (dns) exists
+        if isinstance(zone, BaseException):
+            raise zone
+        if not zone:
+            print(f"\nDNS Zone {domain_name} not found in UltraDNS, exiting...\n")
+            sys.exit(1)
+
+        # Async validate one domains!
+        await validate_domains(
+            dv_obj=dv_obj,
+            dns_obj=dns_obj,
+            expiring_domains=domain,
+            timeout=timeout,
+            assume_yes=assume_yes,
+        )
 
 
 async def runall(
     key: str,
     username: str,
     password: str,
-    file: str = None,
+    file: Optional[str] = None,
     num_days: int = 90,
     timeout: int = 240,
-    expiring_domains: List[Dict[str, Any]] = None,
+    expiring_domains: Optional[List[Dict[str, Any]]] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    assume_yes: bool = False,
 ) -> None:
     """
     Validate the Domains!
@@ -275,6 +452,54 @@ async def runall(
         file: filename
         num_days: num days
         expiring_domains: List of domains to validate, expiring 'soon' or manually validating
+        concurrency: max number of domains being validated at the same time
+        assume_yes: don't ask for confirmation before validating
+
+    Returns:
+        None
+
+    Raises:
+        N/A
+    """
+    _init_logging()
+    async with clients(key=key, username=username, password=password) as (
+        dv_obj,
+        dns_obj,
+    ):
+        await validate_domains(
+            dv_obj=dv_obj,
+            dns_obj=dns_obj,
+            file=file,
+            num_days=num_days,
+            timeout=timeout,
+            expiring_domains=expiring_domains,
+            concurrency=concurrency,
+            assume_yes=assume_yes,
+        )
+
+
+async def validate_domains(
+    dv_obj: DomainValidator,
+    dns_obj: DNSUpdater,
+    file: Optional[str] = None,
+    num_days: int = 90,
+    timeout: int = 240,
+    expiring_domains: Optional[List[Dict[str, Any]]] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    assume_yes: bool = False,
+) -> None:
+    """
+    Validate the Domains, with clients already set up (see clients)
+
+    Args:
+        dv_obj: DigiCert API Instance
+        dns_obj: Neustar/UltraDNS Instance, logged in
+        timeout: Optional int, length of timeout on validation check
+        file: filename
+        num_days: num days
+        expiring_domains: List of domains to validate, expiring 'soon' or manually validating
+        concurrency: max number of domains being validated at the same time
+        assume_yes: don't ask for confirmation before validating
 
     Returns:
         None
@@ -290,10 +515,6 @@ async def runall(
     )
     logger.info("")
 
-    dv_obj = DomainValidator(key=key)
-    dns_obj = DNSUpdater(username=username, password=password)
-    await dns_obj.login()
-
     # Get/print all expiring 'soon' domains
     if file:
         expiring_domains = await get_domains_from_file(
@@ -310,75 +531,148 @@ async def runall(
         print("\nNo expiring domains found, exiting...\n")
         sys.exit(0)
 
-    yesno = ""
+    yesno = "y" if assume_yes else ""
     while yesno.lower() not in ("y", "n"):
-        yesno = input("\nThe above domains will be validated, continue? [y/n]")
+        yesno = await ask("\nThe above domains will be validated, continue? [y/n]")
     if yesno.lower() == "n":
         print("Aborting validation steps.\n")
         sys.exit(0)
 
-    # DigiCert API has rate-limit of 100 calls per 5 seconds.
-    if len(expiring_domains) >= 40:
-        limit = asyncio.Semaphore(value=20)
-    else:
-        limit = None
-
     print("\nValidating..\n")
-    # Async validate em all
-    coroutines = [
-        validate_domain_limiter(
-            dv_obj=dv_obj, dns_obj=dns_obj, domain=domain, limit=limit, timeout=timeout
-        )
-        for domain in expiring_domains
+    # Async submit em all and create their CNAMEs
+    results = await setup_domains(
+        dv_obj=dv_obj,
+        dns_obj=dns_obj,
+        domains=expiring_domains,
+        concurrency=concurrency,
+    )
+    submitted = [
+        (domain, result)
+        for domain, result in zip(expiring_domains, results)
+        if result.cname
     ]
-    results = await asyncio.gather(*coroutines)
+
+    # Wait on all the submitted domains at once, cleanup DNS as each one is validated
+    submitted_by_id = {
+        domain["id"]: (domain, response) for domain, response in submitted
+    }
+    cleanups = []
+    async for domain_id, valid in dv_obj.iter_validation(
+        domains=[domain for domain, _ in submitted], timeout=timeout
+    ):
+        domain, response = submitted_by_id[domain_id]
+        cleanups.append(
+            asyncio.ensure_future(
+                cleanup_domain(
+                    dns_obj=dns_obj,
+                    domain=domain,
+                    response=response,
+                    valid=valid,
+                    timeout=timeout,
+                )
+            )
+        )
+    await asyncio.gather(*cleanups)
 
     print_final_results(results)
 
 
-async def validate_domain_limiter(
+async def setup_domains(
     dv_obj: DomainValidator,
     dns_obj: DNSUpdater,
-    domain: Dict[str, Any],
-    limit: Optional[asyncio.Semaphore],
-    timeout: int = 240,
-) -> DCVResponse:
+    domains: List[Dict[str, Any]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> List[DCVResponse]:
     """
-    Validate Domain Wrapper / Limit if necessary.
+    Submit every domain for validation and create its CNAME, as a two stage pipeline
+
+    At most concurrency domains are talking to DigiCert at once, and
+    DomainValidator paces their requests to its rate-limit. Submitted domains are
+    queued up for the UltraDNS workers, which create the CNAMEs while the next
+    domains are being submitted. Workers are done with a domain once its CNAME
+    exists, waiting for validation is polled in bulk afterwards.
 
-    DigiCert API has rate-limit of 100 calls per 5 seconds.
-    Limit jobs in batches, if <40 jobs, don't do the unnecessary sleep at the end.
+    Args:
+        dv_obj: DigiCert API Instance
+        dns_obj: Neustar/UltraDNS Instance
+        domains: domains to be validated
+        concurrency: number of workers per stage
+
+    Returns:
+        List of DCVResponse, in the same order as domains
+
+    Raises:
+        N/A
     """
-    if not limit:
-        return await validate_domain(
-            dv_obj=dv_obj, dns_obj=dns_obj, domain=domain, timeout=timeout
-        )
-    async with limit:
-        result = await validate_domain(
-            dv_obj=dv_obj, dns_obj=dns_obj, domain=domain, timeout=timeout
-        )
-        # print("Waiting 6 seconds for next batch so DigiCert doesn't block us...")
-        # await asyncio.sleep(6)
-        return result
+    pending: asyncio.Queue[Tuple[int, Dict[str, Any]]] = asyncio.Queue()
+    for index, domain in enumerate(domains):
+        pending.put_nowait((index, domain))
+    # Bounded, so DigiCert can't run away from UltraDNS
+    submitted: asyncio.Queue[
+        Optional[Tuple[Dict[str, Any], DCVResponse, str]]
+    ] = asyncio.Queue(maxsize=2 * concurrency)
+    results: Dict[int, DCVResponse] = {}
+
+    async def submitter() -> None:
+        while not pending.empty():
+            index, domain = pending.get_nowait()
+            try:
+                response, verification_value = await submit_domain(
+                    dv_obj=dv_obj, domain=domain
+                )
+            except Exception as e:  # One failed domain shouldn't take the rest down
+                response = DCVResponse(domain["name"], False, False, f"Error: {e}")
+                verification_value = None
+            results[index] = response
+            if verification_value:
+                await submitted.put((domain, response, verification_value))
+
+    async def cname_creator() -> None:
+        while True:
+            item = await submitted.get()
+            if item is None:
+                return
+            domain, response, verification_value = item
+            try:
+                await create_domain_cname(
+                    dns_obj=dns_obj,
+                    domain=domain,
+                    response=response,
+                    verification_value=verification_value,
+                )
+            except Exception as e:
+                response.cname = None
+                response.message = f"Error: {e}"
+
+    workers = min(concurrency, len(domains))
+    creators = [asyncio.ensure_future(cname_creator()) for _ in range(workers)]
+    try:
+        await asyncio.gather(*(submitter() for _ in range(workers)))
+        for _ in creators:
+            await submitted.put(None)
+        await asyncio.gather(*creators)
+    finally:
+        for creator in creators:
+            creator.cancel()
 
+    return [results[index] for index in range(len(domains))]
 
-async def validate_domain(
+
+async def submit_domain(
     dv_obj: DomainValidator,
-    dns_obj: DNSUpdater,
     domain: Dict[str, Any],
-    timeout: int = 240,
-) -> DCVResponse:
+) -> Tuple[DCVResponse, Optional[str]]:
     """
-    DCV - Meat and Potatoes
+    DCV - Meat and Potatoes, DigiCert half
+
+    Switch the domain to dns-cname-token if needed and submit it for validation.
 
     Args:
         dv_obj: DigiCert API Instance
-        dns_obj: Neustar/UltraDNS Instance
         domain: domain to be validated
-        timeout: Optional int, length of timeout on validation check
 
     Returns:
-        None
+        DCVResponse (cname holds the dcv_token) and verification_value, None on failure
 
     Raises:
         N/A
@@ -387,27 +681,54 @@ async def validate_domain(
 
     # Change DCV_Method to dns-cname-token if needed, get dcv_token if not.
     if domain["dcv_method"] != "dns-cname-token":
-        print(
-            f"Changing DCV method to dns-cname-token for domain {domain['name']}: ",
-            end="",
-        )
         dcv_token, err = await dv_obj.change_dcv_method(
             domain=domain, dcv_type="dns-cname-token"
         )
         if dcv_token == "Failed":
             response.message = err
-            return response
+            return response, None
 
-        print("DCV method updated.\n")
+        logger.info(f"DCV method for {domain['name']} updated to dns-cname-token.")
 
     # Submit for validation and get dcv_token and verification_value
     dcv_token, err = await dv_obj.submit_for_validation(domain=domain)
     if dcv_token == "Failed":
         response.message = err
-        return response
+        return response, None
 
     verification_value = err  # Not an error at this point, just renaming
-    print(f"\nSubmitted {domain['name']} for validation.")
+    logger.info(f"Submitted {domain['name']} for validation.")
+    response.cname = dcv_token
+
+    return response, verification_value
+
+
+async def create_domain_cname(
+    dns_obj: DNSUpdater,
+    domain: Dict[str, Any],
+    response: DCVResponse,
+    verification_value: str,
+) -> DCVResponse:
+    """
+    DCV - Meat and Potatoes, Neustar/UltraDNS half
+
+    Create the CNAME for a submitted domain, response.cname is cleared if that fails.
+
+    Args:
+        dns_obj: Neustar/UltraDNS Instance
+        domain: domain submitted for validation
+        response: DCVResponse from submit_domain
+        verification_value: cname value (normally dcv.digicert.com)
+
+    Returns:
+        DCVResponse
+
+    Raises:
+        N/A
+    """
+    dcv_token = response.cname
+    if dcv_token is None:  # submit_domain failed, no token to create a CNAME for
+        return response
 
     # Create DNS CNAME record w/ token
     api_response = await dns_obj.create_cname_record(
@@ -415,56 +736,63 @@ async def validate_domain(
     )
     if api_response != "Successful":
         response.message = api_response
+        response.cname = None
         return response
-    message = f"CNAME: {dcv_token}.{domain['name']} created."
-    print(message)
-    logger.info(message)
+    logger.info(f"CNAME: {dcv_token}.{domain['name']} created.")
 
-    # Check for validation every 240 seconds for up to timeout value (default 240 seconds)
-    attempts = 1
-    max_attempts = timeout / 240
-    response.message = (
-        "Timeout is 0, not checking statuses, use dcv check -d and cleanup DNS manually."
-        if not max_attempts
-        else "Success"
-    )
+    return response
 
-    while not response.valid and max_attempts > 0:
-        if attempts == 1:
-            print("Beginning check validation period, please wait..")
-        elif attempts > max_attempts:
-            message = f"Giving up on {domain['name']} after too many retries. "
-            print(message)
-            logging.warning(message)
-            break
-        await asyncio.sleep(timeout)
-        print(f"Checking {domain['name']} for validation, attempt #{attempts}.")
-        response.valid = await dv_obj.check_for_validation(domain=domain)
-        attempts += 1
+
+async def cleanup_domain(
+    dns_obj: DNSUpdater,
+    domain: Dict[str, Any],
+    response: DCVResponse,
+    valid: bool,
+    timeout: int = 240,
+) -> DCVResponse:
+    """
+    Record the validation result and delete the domain's CNAME
+
+    Args:
+        dns_obj: Neustar/UltraDNS Instance
+        domain: domain that was submitted for validation
+        response: DCVResponse from submit_domain
+        valid: whether the domain was validated
+        timeout: Optional int, length of timeout on validation check
+
+    Returns:
+        DCVResponse
+
+    Raises:
+        N/A
+    """
+    response.valid = valid
+    if not timeout:
+        response.message = (
+            "Timeout is 0, not checking statuses, "
+            "use dcv check -d and cleanup DNS manually."
+        )
 
     if response.valid:
-        message = f"Domain {domain['name']} successfully validated!"
-        print(message)
-        logger.info(message)
+        logger.info(f"Domain {domain['name']} successfully validated!")
         response.cleanup = True
 
     else:
         logger.error(f"Error, {domain['name']} was not validated.")
 
     # DNS Cleanup
+    if response.cname is None:  # CNAME was never created
+        return response
     api_response = await dns_obj.delete_cname_record(
-        domain_name=domain["name"], cname=dcv_token
+        domain_name=domain["name"], cname=response.cname
     )
     if api_response == "Successful":
         response.cleanup = True
-        message = f"DNS for {domain['name']} cleaned up."
-        print(message)
-        logger.info(message)
+        logger.info(f"DNS for {domain['name']} cleaned up.")
     else:
         response.message = api_response
-        print(response.message)
         logger.error(response.message)
-        logger.error(f"Error, {dcv_token}.{domain['name']} was not cleaned up.")
+        logger.error(f"Error, {response.cname}.{domain['name']} was not cleaned up.")
         return response
 
     return response
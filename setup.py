@@ -8,7 +8,14 @@ setuptools.setup(
     name="dcv",
     version=__version__,
     packages=["dcv"],
-    install_requires=["httpx>=0.22.0", "typer>=0.4.1"],
+    install_requires=[
+        "aiodns>=3.1.0",
+        "httpcore>=0.17.2",  # sni_hostname request extension, see dcv.transport
+        "httpx[http2]>=0.24.0",
+        "orjson>=3.6.0",
+        "typer>=0.4.1",
+        'uvloop>=0.16.0; platform_system != "Windows"',
+    ],
     classifiers=[
         "License :: OSI Approved :: GNU General Public License v3 or later (GPLv3+)",
         "Operating System :: POSIX :: Linux",
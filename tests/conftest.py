@@ -0,0 +1,67 @@
+"""Fixtures faking the DigiCert and Neustar/UltraDNS APIs with httpx.MockTransport"""
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+import pytest
+
+from dcv import dns_updater, domain_validator
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+@pytest.fixture
+def mock_api(monkeypatch: pytest.MonkeyPatch) -> Callable[[Handler], None]:
+    """
+    Route every client DomainValidator/DNSUpdater opens to a request handler
+
+    Args:
+        monkeypatch: pytest fixture
+
+    Returns:
+        Function taking the handler, call it before opening the clients
+
+    Raises:
+        N/A
+    """
+
+    def install(handler: Handler) -> None:
+        def client_kwargs(**_: Any) -> Dict[str, Any]:
+            return {"transport": httpx.MockTransport(handler)}
+
+        monkeypatch.setattr(domain_validator, "client_kwargs", client_kwargs)
+        monkeypatch.setattr(dns_updater, "client_kwargs", client_kwargs)
+
+    return install
+
+
+@pytest.fixture
+def slept(monkeypatch: pytest.MonkeyPatch) -> List[float]:
+    """
+    Make asyncio.sleep return at once, moving the event loop clock forward instead
+
+    Args:
+        monkeypatch: pytest fixture
+
+    Returns:
+        List of every delay slept, in order
+
+    Raises:
+        N/A
+    """
+    delays: List[float] = []
+    offset = [0.0]
+    real_sleep = asyncio.sleep
+    real_monotonic = time.monotonic
+
+    async def sleep(delay: float, result: Optional[Any] = None) -> Any:
+        delays.append(delay)
+        offset[0] += max(delay, 0)
+        return await real_sleep(0, result)
+
+    # The event loop's time() is time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: real_monotonic() + offset[0])
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+
+    return delays
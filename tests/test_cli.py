@@ -0,0 +1,45 @@
+"""Tests for dcv.cli"""
+import asyncio
+import importlib
+import logging
+from types import ModuleType
+from typing import Iterator
+
+import pytest
+
+
+@pytest.fixture
+def cli() -> Iterator[ModuleType]:
+    """dcv.cli, leaving the event loop policy and dcv log level as they were"""
+    policy = asyncio.get_event_loop_policy()
+    logger = logging.getLogger("dcv")
+    level = logger.level
+
+    yield importlib.import_module("dcv.cli")
+
+    asyncio.set_event_loop_policy(policy)
+    logger.setLevel(level)
+
+
+def test_dcv_log_level(
+    cli: ModuleType, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setenv("DCV_LOG", "debug")
+
+    cli.begin()
+
+    assert logging.getLogger("dcv").level == logging.DEBUG
+    assert "Warning" not in capsys.readouterr().out
+
+
+def test_dcv_log_unknown_level_falls_back_to_info(
+    cli: ModuleType, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setenv("DCV_LOG", "verbose")
+
+    cli.begin()
+
+    assert logging.getLogger("dcv").level == logging.INFO
+    assert (
+        "Warning: unknown DCV_LOG level VERBOSE, using INFO" in capsys.readouterr().out
+    )
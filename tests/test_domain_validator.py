@@ -0,0 +1,274 @@
+"""Tests for dcv.domain_validator"""
+import asyncio
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import pytest
+
+from dcv.domain_validator import DomainValidator, _is_expiring, _RateLimiter
+from dcv.errors import DCVAPIError
+
+VALIDATED = [
+    {"type": "ov", "status": "active", "dcv_status": "complete"},
+    {"type": "ev", "status": "active", "dcv_status": "complete"},
+]
+PENDING = [
+    {"type": "ov", "status": "pending", "dcv_status": "pending"},
+    {"type": "ev", "status": "pending", "dcv_status": "pending"},
+]
+
+
+def listing(
+    domains: List[Dict[str, Any]], cap: int = 1000
+) -> Callable[[httpx.Request], httpx.Response]:
+    """Serve the domain listing like DigiCert does, at most cap domains per page"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/services/v2/domain"
+        limit = min(int(request.url.params["limit"]), cap)
+        offset = int(request.url.params["offset"])
+        return httpx.Response(
+            200,
+            json={
+                "domains": domains[offset : offset + limit],
+                "page": {"total": len(domains), "limit": limit, "offset": offset},
+            },
+        )
+
+    return handler
+
+
+async def collect_domains(domain_name: Optional[str] = None) -> List[Dict[str, Any]]:
+    async with DomainValidator(key="KEY") as dv_obj:
+        return [domain async for domain in dv_obj.iter_domains(domain_name=domain_name)]
+
+
+async def collect_validation(
+    domains: List[Dict[str, Any]], timeout: int
+) -> List[Tuple[int, bool]]:
+    async with DomainValidator(key="KEY") as dv_obj:
+        return [item async for item in dv_obj.iter_validation(domains, timeout=timeout)]
+
+
+def test_iter_domains_fetches_every_page(mock_api: Any) -> None:
+    domains = [{"id": i, "name": f"d{i}.example.com"} for i in range(2500)]
+    offsets: List[str] = []
+    handler = listing(domains)
+
+    def recording(request: httpx.Request) -> httpx.Response:
+        offsets.append(request.url.params["offset"])
+        return handler(request)
+
+    mock_api(recording)
+    found = asyncio.run(collect_domains())
+
+    assert sorted(offsets) == ["0", "1000", "2000"]
+    assert sorted(domain["id"] for domain in found) == list(range(2500))
+
+
+def test_iter_domains_steps_by_the_page_size_digicert_used(mock_api: Any) -> None:
+    domains = [{"id": i, "name": f"d{i}.example.com"} for i in range(250)]
+    mock_api(listing(domains, cap=100))
+
+    found = asyncio.run(collect_domains())
+
+    assert sorted(domain["id"] for domain in found) == list(range(250))
+
+
+def test_iter_domains_single_page(mock_api: Any) -> None:
+    requests: List[httpx.Request] = []
+    handler = listing([{"id": 1, "name": "example.com"}])
+
+    def recording(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return handler(request)
+
+    mock_api(recording)
+    found = asyncio.run(collect_domains(domain_name="example.com"))
+
+    assert found == [{"id": 1, "name": "example.com"}]
+    assert len(requests) == 1
+    assert requests[0].url.params["filters[search]"] == "example.com"
+
+
+def test_iter_domains_failed_page_cancels_the_rest(mock_api: Any) -> None:
+    domains = [{"id": i, "name": f"d{i}.example.com"} for i in range(5000)]
+    handler = listing(domains)
+    cancelled: List[str] = []
+
+    async def failing(request: httpx.Request) -> httpx.Response:
+        offset = request.url.params["offset"]
+        if offset == "0":
+            return handler(request)
+        if offset == "1000":
+            return httpx.Response(500, json={})
+        try:
+            await asyncio.Event().wait()  # Never answers
+        except asyncio.CancelledError:
+            cancelled.append(offset)
+            raise
+        return handler(request)
+
+    async def cancelled_on_error() -> List[str]:
+        with pytest.raises(DCVAPIError):
+            await collect_domains()
+        return sorted(cancelled)  # Before asyncio.run cancels whatever is left over
+
+    mock_api(failing)
+
+    assert asyncio.run(cancelled_on_error()) == ["2000", "3000", "4000"]
+
+
+def test_iter_validation_yields_domains_as_they_validate(
+    mock_api: Any, slept: List[float]
+) -> None:
+    polls: Dict[int, int] = {}
+    validated_after = {1: 1, 2: 3}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        ids = [int(i) for i in request.url.params["filters[id]"].split(",")]
+        body = []
+        for domain_id in ids:
+            polls[domain_id] = polls.get(domain_id, 0) + 1
+            validations = (
+                VALIDATED if polls[domain_id] >= validated_after[domain_id] else PENDING
+            )
+            body.append({"id": domain_id, "validations": validations})
+        return httpx.Response(200, json={"domains": body, "page": {"total": len(body)}})
+
+    mock_api(handler)
+    results = asyncio.run(collect_validation([{"id": 1}, {"id": 2}], timeout=240))
+
+    assert results == [(1, True), (2, True)]
+    assert polls == {1: 1, 2: 3}  # Validated domains drop out of the next check
+    assert slept == sorted(slept)  # Backing off
+
+
+def test_iter_validation_gives_up_at_the_timeout(
+    mock_api: Any, slept: List[float]
+) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        ids = [int(i) for i in request.url.params["filters[id]"].split(",")]
+        body = [{"id": domain_id, "validations": PENDING} for domain_id in ids]
+        return httpx.Response(200, json={"domains": body, "page": {"total": len(body)}})
+
+    mock_api(handler)
+    results = asyncio.run(collect_validation([{"id": 1}, {"id": 2}], timeout=60))
+
+    assert results == [(1, False), (2, False)]
+    assert sum(slept) <= 60.5  # Plus whatever the requests took
+
+
+def test_iter_validation_rate_limited_stays_within_the_timeout(
+    mock_api: Any, slept: List[float]
+) -> None:
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(429, headers={"Retry-After": "7"}, json={})
+
+    mock_api(handler)
+    results = asyncio.run(collect_validation([{"id": 1}], timeout=20))
+
+    assert results == [(1, False)]
+    assert sum(slept) <= 20.5
+    # Only iter_validation backs off, one request per check
+    assert len(requests) == len(slept)
+
+
+def test_iter_validation_batches_ids(mock_api: Any, slept: List[float]) -> None:
+    batches: List[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        ids = [int(i) for i in request.url.params["filters[id]"].split(",")]
+        batches.append(len(ids))
+        body = [{"id": domain_id, "validations": VALIDATED} for domain_id in ids]
+        return httpx.Response(200, json={"domains": body, "page": {"total": len(body)}})
+
+    mock_api(handler)
+    results = asyncio.run(
+        collect_validation([{"id": i} for i in range(2500)], timeout=240)
+    )
+
+    assert batches == [1000, 1000, 500]
+    assert sorted(results) == [(i, True) for i in range(2500)]
+
+
+def test_rate_limiter_sliding_window(slept: List[float]) -> None:
+    async def send(count: int) -> List[float]:
+        limiter = _RateLimiter(calls=3, period=5.0)
+        loop = asyncio.get_running_loop()
+        sent = []
+        for _ in range(count):
+            await limiter.acquire()
+            sent.append(loop.time())
+        return sent
+
+    sent = asyncio.run(send(7))
+
+    # 3 at once, 3 more once the first ones leave the window 5s later, then the last
+    assert len(slept) == 2
+    for index in range(3, len(sent)):
+        assert sent[index] - sent[index - 3] >= 5.0 - 1e-3
+    assert sent[-1] - sent[0] >= 10.0 - 1e-3
+
+
+def test_rate_limiter_concurrent_callers(slept: List[float]) -> None:
+    async def send(count: int) -> List[float]:
+        limiter = _RateLimiter(calls=10, period=1.0)
+        loop = asyncio.get_running_loop()
+        sent: List[float] = []
+
+        async def one() -> None:
+            await limiter.acquire()
+            sent.append(loop.time())
+
+        await asyncio.gather(*(one() for _ in range(count)))
+        return sorted(sent)
+
+    sent = asyncio.run(send(35))
+
+    # Times are read just after acquire(), allow for the clock moving on meanwhile
+    for index in range(10, len(sent)):
+        assert sent[index] - sent[index - 10] >= 1.0 - 1e-3
+
+
+def test_is_expiring_cutoff_day() -> None:
+    def domain(ev: str, ov: str) -> Dict[str, Any]:
+        return {"name": "example.com", "dcv_expiration": {"ev": ev, "ov": ov}}
+
+    assert _is_expiring(domain("2026-01-31", "2026-03-01"), "2026-01-31")
+    assert _is_expiring(domain("2026-03-01", "2026-01-30"), "2026-01-31")
+    assert not _is_expiring(domain("2026-02-01", "2026-03-01"), "2026-01-31")
+
+
+def test_is_expiring_never_validated() -> None:
+    assert _is_expiring({"name": "example.com"}, "2026-01-31")
+    assert _is_expiring({"name": "example.com", "dcv_expiration": {}}, "2026-01-31")
+
+
+def test_get_expiring_domains_keeps_never_validated(mock_api: Any) -> None:
+    soon = (date.today() + timedelta(days=10)).isoformat()
+    later = (date.today() + timedelta(days=200)).isoformat()
+    domains = [
+        {
+            "id": 1,
+            "name": "d1.example.com",
+            "dcv_expiration": {"ev": soon, "ov": later},
+        },
+        {
+            "id": 2,
+            "name": "d2.example.com",
+            "dcv_expiration": {"ev": later, "ov": later},
+        },
+        {"id": 3, "name": "d3.example.com"},
+    ]
+    mock_api(listing(domains))
+
+    async def expiring() -> List[Dict[str, Any]]:
+        async with DomainValidator(key="KEY") as dv_obj:
+            return await dv_obj.get_expiring_domains(num_days=90)
+
+    assert [domain["id"] for domain in asyncio.run(expiring())] == [1, 3]
@@ -0,0 +1,209 @@
+"""Tests for dcv.transport"""
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Callable, List, Optional
+
+import aiodns
+import httpx
+import pytest
+
+from dcv import transport
+from dcv.transport import CachingResolverTransport, client_kwargs
+
+PROXY_VARS = ("http_proxy", "https_proxy", "all_proxy", "no_proxy")
+
+
+def clear_proxies(monkeypatch: pytest.MonkeyPatch) -> None:
+    for var in PROXY_VARS:
+        monkeypatch.delenv(var, raising=False)
+        monkeypatch.delenv(var.upper(), raising=False)
+
+
+@pytest.fixture
+def lookups(monkeypatch: pytest.MonkeyPatch) -> Callable[..., List[str]]:
+    """
+    Stub aiodns lookups, every host resolves to 192.0.2.1
+
+    Args:
+        monkeypatch: pytest fixture
+
+    Returns:
+        Function taking the record ttl (None: the lookup fails) and whether there
+        are any answers, returning the list of hosts looked up
+
+    Raises:
+        N/A
+    """
+
+    def install(ttl: Optional[int] = 60, nodes: bool = True) -> List[str]:
+        hosts: List[str] = []
+
+        async def getaddrinfo(self: Any, host: str, **kwargs: Any) -> Any:
+            hosts.append(host)
+            if ttl is None:
+                raise aiodns.error.DNSError(4, "Domain name not found")
+            node = SimpleNamespace(addr=(b"192.0.2.1", 0), ttl=ttl)
+            return SimpleNamespace(nodes=[node] if nodes else [])
+
+        monkeypatch.setattr(aiodns.DNSResolver, "getaddrinfo", getaddrinfo)
+        return hosts
+
+    return install
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> List[float]:
+    """Freeze the clock the address cache uses, move it with clock[0] += seconds"""
+    now = [1000.0]
+    monkeypatch.setattr(transport.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def sent(monkeypatch: pytest.MonkeyPatch) -> List[httpx.Request]:
+    """Capture what CachingResolverTransport hands to httpx, nothing goes on the wire"""
+    requests: List[httpx.Request] = []
+
+    async def handle_async_request(self: Any, request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200)
+
+    monkeypatch.setattr(
+        httpx.AsyncHTTPTransport, "handle_async_request", handle_async_request
+    )
+    return requests
+
+
+def run_resolve(
+    hosts: List[str], advance: Callable[[int], None] = lambda _: None
+) -> List[Any]:
+    async def resolve() -> List[Any]:
+        resolver = CachingResolverTransport()
+        answers = []
+        for index, host in enumerate(hosts):
+            advance(index)
+            answers.append(await resolver.resolve(host))
+        await resolver.aclose()
+        return answers
+
+    return asyncio.run(resolve())
+
+
+def test_resolve_caches_answers(lookups: Any, clock: List[float]) -> None:
+    hosts = lookups(ttl=60)
+
+    answers = run_resolve(["api.example.com", "api.example.com", "www.example.com"])
+
+    assert answers == ["192.0.2.1"] * 3
+    assert hosts == ["api.example.com", "www.example.com"]
+
+
+def test_resolve_expires_after_the_record_ttl(lookups: Any, clock: List[float]) -> None:
+    hosts = lookups(ttl=60)
+
+    def advance(index: int) -> None:
+        clock[0] += [0, 59, 2][index]
+
+    run_resolve(["api.example.com"] * 3, advance)
+
+    assert hosts == ["api.example.com"] * 2  # Cached at 59s, looked up again at 61s
+
+
+@pytest.mark.parametrize("ttl", [3600, 0])
+def test_resolve_caps_the_ttl(lookups: Any, clock: List[float], ttl: int) -> None:
+    hosts = lookups(ttl=ttl)
+
+    def advance(index: int) -> None:
+        clock[0] += [0, 299, 2][index]
+
+    run_resolve(["api.example.com"] * 3, advance)
+
+    assert hosts == ["api.example.com"] * 2  # Cached at 299s, looked up again at 301s
+
+
+@pytest.mark.parametrize("ttl, nodes", [(None, True), (60, False)])
+def test_resolve_failure_is_not_cached(
+    lookups: Any, ttl: Optional[int], nodes: bool
+) -> None:
+    hosts = lookups(ttl=ttl, nodes=nodes)
+
+    assert run_resolve(["api.example.com"] * 2) == [None, None]
+    assert hosts == ["api.example.com"] * 2
+
+
+async def send(url: str) -> None:
+    async with httpx.AsyncClient(transport=CachingResolverTransport()) as client:
+        await client.get(url)
+
+
+def test_request_goes_to_the_resolved_address(
+    lookups: Any, sent: List[httpx.Request]
+) -> None:
+    lookups(ttl=60)
+
+    asyncio.run(send("https://api.example.com:8443/v2/domain?limit=1"))
+
+    assert len(sent) == 1
+    assert str(sent[0].url) == "https://192.0.2.1:8443/v2/domain?limit=1"
+    assert sent[0].headers["Host"] == "api.example.com:8443"
+    assert sent[0].extensions["sni_hostname"] == "api.example.com"
+
+
+@pytest.mark.parametrize(
+    "url", ["https://203.0.113.5/v2/domain", "https://[2001:db8::1]/v2"]
+)
+def test_request_to_an_ip_address_is_not_resolved(
+    lookups: Any, sent: List[httpx.Request], url: str
+) -> None:
+    hosts = lookups(ttl=60)
+
+    asyncio.run(send(url))
+
+    assert hosts == []
+    assert str(sent[0].url) == url
+    assert "sni_hostname" not in sent[0].extensions
+
+
+def test_request_unresolved_is_left_to_httpx(
+    lookups: Any, sent: List[httpx.Request]
+) -> None:
+    lookups(ttl=None)
+
+    asyncio.run(send("https://api.example.com/v2/domain"))
+
+    assert str(sent[0].url) == "https://api.example.com/v2/domain"
+    assert "sni_hostname" not in sent[0].extensions
+
+
+def test_aclose_closes_the_resolver(lookups: Any) -> None:
+    lookups(ttl=60)
+
+    async def resolve_and_close() -> Optional[aiodns.DNSResolver]:
+        resolver = CachingResolverTransport()
+        await resolver.resolve("api.example.com")
+        assert resolver.resolver is not None
+        await resolver.aclose()
+        return resolver.resolver
+
+    assert asyncio.run(resolve_and_close()) is None
+
+
+@pytest.mark.parametrize("name", ["HTTPS_PROXY", "http_proxy", "ALL_PROXY"])
+def test_client_kwargs_with_a_proxy(monkeypatch: pytest.MonkeyPatch, name: str) -> None:
+    clear_proxies(monkeypatch)
+    monkeypatch.setenv(name, "http://proxy.example.com:3128")
+    limits = httpx.Limits(max_connections=10)
+
+    kwargs = client_kwargs(http2=True, limits=limits)
+
+    # httpx's own transport, so the proxy (and NO_PROXY) settings apply
+    assert kwargs == {"http2": True, "limits": limits}
+
+
+def test_client_kwargs_without_a_proxy(monkeypatch: pytest.MonkeyPatch) -> None:
+    clear_proxies(monkeypatch)
+
+    kwargs = client_kwargs(http2=True, limits=httpx.Limits(max_connections=10))
+
+    assert list(kwargs) == ["transport"]
+    assert isinstance(kwargs["transport"], CachingResolverTransport)
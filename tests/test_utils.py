@@ -0,0 +1,128 @@
+"""Tests for dcv.utils"""
+import asyncio
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import httpx
+import pytest
+
+from dcv.dns_updater import DNSUpdater
+from dcv.domain_validator import DomainValidator
+from dcv.utils import DCVResponse, read_domains_from_file, setup_domains
+
+DOMAINS = [
+    {"id": 1, "name": "d1.example.com", "dcv_method": "dns-cname-token"},
+    {"id": 2, "name": "d2.example.com", "dcv_method": "email"},
+    {"id": 3, "name": "d3.example.com", "dcv_method": "dns-cname-token"},
+    {"id": 4, "name": "d4.example.com", "dcv_method": "dns-cname-token"},
+]
+
+
+def api(
+    calls: List[Tuple[str, str]], digicert_fails: int = 0, ultradns_fails: int = 0
+) -> Any:
+    """Fake DigiCert and UltraDNS, failing DigiCert/UltraDNS for the given domain ids"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, request.url.path))
+        token = {"dcv_token": {"token": "", "verification_value": "dcv.digicert.com"}}
+
+        match = re.fullmatch(
+            r"/services/v2/domain/(\d+)/(validation|dcv/method)", request.url.path
+        )
+        if match:
+            domain_id = int(match.group(1))
+            if domain_id == digicert_fails:
+                return httpx.Response(500, json={})
+            token["dcv_token"]["token"] = f"tok{domain_id}"
+            status = 201 if match.group(2) == "validation" else 200
+            return httpx.Response(status, json=token)
+
+        match = re.fullmatch(
+            r"/zones/d(\d+)\.example\.com\./rrsets/cname/tok\d+", request.url.path
+        )
+        if match and request.method == "POST":
+            if int(match.group(1)) == ultradns_fails:
+                return httpx.Response(500, json={})
+            return httpx.Response(201, json={"message": "Successful"})
+
+        return httpx.Response(404, json={})
+
+    return handler
+
+
+async def run_setup(
+    domains: List[Dict[str, Any]], concurrency: int
+) -> List[DCVResponse]:
+    async with DomainValidator(key="KEY") as dv_obj:
+        async with DNSUpdater(username="user", password="pass") as dns_obj:
+            return await setup_domains(
+                dv_obj, dns_obj, domains, concurrency=concurrency
+            )
+
+
+def test_setup_domains_submits_and_creates_cnames(mock_api: Any) -> None:
+    calls: List[Tuple[str, str]] = []
+    mock_api(api(calls))
+
+    results = asyncio.run(run_setup(DOMAINS, concurrency=2))
+
+    assert [result.domain_name for result in results] == [d["name"] for d in DOMAINS]
+    assert [result.cname for result in results] == ["tok1", "tok2", "tok3", "tok4"]
+    assert all(result.message == "Success" for result in results)
+    # Only the email domain had to switch its dcv method first
+    assert [path for method, path in calls if method == "PUT"] == [
+        "/services/v2/domain/2/dcv/method"
+    ]
+    assert sum(1 for method, path in calls if path.startswith("/zones")) == 4
+
+
+def test_setup_domains_digicert_failure(mock_api: Any) -> None:
+    calls: List[Tuple[str, str]] = []
+    mock_api(api(calls, digicert_fails=3))
+
+    results = asyncio.run(run_setup(DOMAINS, concurrency=32))
+
+    assert [result.cname for result in results] == ["tok1", "tok2", None, "tok4"]
+    assert results[2].message == "Failed to submit d3.example.com for validation."
+    # No CNAME for the domain DigiCert didn't take
+    assert not any("d3.example.com" in path for _, path in calls)
+
+
+def test_setup_domains_ultradns_failure(mock_api: Any) -> None:
+    calls: List[Tuple[str, str]] = []
+    mock_api(api(calls, ultradns_fails=1))
+
+    results = asyncio.run(run_setup(DOMAINS, concurrency=1))
+
+    assert [result.cname for result in results] == [None, "tok2", "tok3", "tok4"]
+    assert results[0].message.startswith(
+        "Creating CNAME record tok1.d1.example.com Failed"
+    )
+
+
+def test_setup_domains_no_domains(mock_api: Any) -> None:
+    calls: List[Tuple[str, str]] = []
+    mock_api(api(calls))
+
+    assert asyncio.run(run_setup([], concurrency=32)) == []
+    assert calls == []
+
+
+def test_read_domains_from_file_strips_lines(tmp_path: Path) -> None:
+    path = tmp_path / "domains.txt"
+    path.write_bytes(
+        b"d1.example.com\r\n  d2.example.com \r\n\r\n \t \nd1.example.com\nd3.example.com"
+    )
+
+    assert read_domains_from_file(str(path)) == {
+        "d1.example.com",
+        "d2.example.com",
+        "d3.example.com",
+    }
+
+
+def test_read_domains_from_file_missing(tmp_path: Path) -> None:
+    with pytest.raises(SystemExit):
+        read_domains_from_file(str(tmp_path / "missing.txt"))